@@ -7,27 +7,42 @@ class AccountMoveLine(models.Model):
 
     def write(self, vals):
         res = super(AccountMoveLine, self).write(vals)
-        if 'partner_id' in vals:
-            for line in self:
-                if line.move_id and line.move_id.partner_id.id != vals['partner_id']:
-                    line.move_id.partner_id = vals['partner_id']
+        if 'partner_id' in vals and not self.env.context.get('no_partner_sync'):
+            moves = self.mapped('move_id')
+            moves.mapped('partner_id')
+            moves_to_update = moves.filtered(lambda m: m.partner_id.id != vals['partner_id'])
+            if moves_to_update:
+                moves_to_update.with_context(no_partner_sync=True).write({'partner_id': vals['partner_id']})
         return res
 
-    @api.model
-    def create(self, vals):
-        res = super(AccountMoveLine, self).create(vals)
-        if 'partner_id' in vals and res.move_id:
-            if res.move_id.partner_id.id != vals['partner_id']:
-                res.move_id.partner_id = vals['partner_id']
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(AccountMoveLine, self).create(vals_list)
+        move_partners = {}
+        for vals, line in zip(vals_list, res):
+            if 'partner_id' in vals and line.move_id:
+                move_partners[line.move_id] = vals['partner_id']
+        partner_moves = {}
+        for move, partner_id in move_partners.items():
+            if move.partner_id.id != partner_id:
+                partner_moves.setdefault(partner_id, self.env['account.move'])
+                partner_moves[partner_id] |= move
+        for partner_id, moves in partner_moves.items():
+            moves.with_context(no_partner_sync=True).write({'partner_id': partner_id})
         return res
 
 class AccountMove(models.Model):
     _inherit = 'account.move'
 
     def action_post(self):
+        # Prefetch the line partners of the whole batch in one query
+        self.mapped('line_ids.partner_id')
+        partner_moves = {}
         for move in self:
             partners = move.line_ids.mapped('partner_id')
-            if partners:
-                if move.partner_id != partners[0]:
-                    move.partner_id = partners[0].id
+            if partners and move.partner_id != partners[0]:
+                partner_moves.setdefault(partners[0].id, self.browse())
+                partner_moves[partners[0].id] |= move
+        for partner_id, moves in partner_moves.items():
+            moves.write({'partner_id': partner_id})
         return super(AccountMove, self).action_post()
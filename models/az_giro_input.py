@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _, Command
 from odoo.exceptions import UserError, ValidationError
 
 
@@ -25,8 +25,7 @@ class AzGiroInput(models.Model):
         string='Partner Type',
         required=True,
         default='vendor',
-        tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        tracking=True
     )
     
     partner_id = fields.Many2one(
@@ -34,34 +33,30 @@ class AzGiroInput(models.Model):
         string='Partner',
         required=True,
         tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        index=True
     )
     
     amount = fields.Monetary(
         string='Amount',
         required=True,
-        tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        tracking=True
     )
     
     date = fields.Date(
         string='Date',
         required=True,
         default=fields.Date.context_today,
-        tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        tracking=True
     )
     
     cheque_reference = fields.Char(
         string='Cheque Reference',
-        tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        tracking=True
     )
     
     memo = fields.Text(
         string='Memo',
-        tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        tracking=True
     )
     
     giro_account_id = fields.Many2one(
@@ -70,7 +65,7 @@ class AzGiroInput(models.Model):
         required=True,
         domain=[('account_type', 'not in', ['asset_receivable', 'liability_payable'])],
         tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        index=True
     )
     
     account_move_id = fields.Many2one(
@@ -78,7 +73,8 @@ class AzGiroInput(models.Model):
         string='Journal Entry',
         readonly=True,
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     
     journal_bank_id = fields.Many2one(
@@ -86,15 +82,14 @@ class AzGiroInput(models.Model):
         string='Bank Journal',
         domain=[('type', '=', 'bank')],
         tracking=True,
-        states={'confirmed': [('readonly', True)], 'cancelled': [('readonly', True)]}
+        index='btree_not_null'
     )
     
     bank_account_id = fields.Many2one(
         'account.account',
         string='Bank Account',
         related='journal_bank_id.default_account_id',
-        readonly=True,
-        store=True
+        readonly=True
     )
     
     clearing_move_id = fields.Many2one(
@@ -102,7 +97,8 @@ class AzGiroInput(models.Model):
         string='Clearing Journal Entry',
         readonly=True,
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     
     reverse_move_id = fields.Many2one(
@@ -110,7 +106,8 @@ class AzGiroInput(models.Model):
         string='Reverse Journal Entry',
         readonly=True,
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     
     reverse_clearing_move_id = fields.Many2one(
@@ -118,7 +115,8 @@ class AzGiroInput(models.Model):
         string='Reverse Clearing Entry',
         readonly=True,
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     
     is_cleared = fields.Boolean(
@@ -130,13 +128,13 @@ class AzGiroInput(models.Model):
     is_reversed = fields.Boolean(
         string='Reversed',
         compute='_compute_is_reversed',
-        store=True
+        search='_search_is_reversed'
     )
     
     is_clearing_reversed = fields.Boolean(
         string='Clearing Reversed',
         compute='_compute_is_clearing_reversed',
-        store=True
+        search='_search_is_clearing_reversed'
     )
     
     state = fields.Selection(
@@ -170,6 +168,16 @@ class AzGiroInput(models.Model):
         default=lambda self: self.env.company.currency_id
     )
 
+    def init(self):
+        """Index the default ordering and the usual list view query: filter on state, ordered by date"""
+        super(AzGiroInput, self).init()
+        tools.create_index(
+            self._cr, 'az_giro_input_date_id_idx', self._table, ['date DESC', 'id DESC']
+        )
+        tools.create_index(
+            self._cr, 'az_giro_input_state_date_idx', self._table, ['state', 'date DESC']
+        )
+
     @api.depends('clearing_move_id')
     def _compute_is_cleared(self):
         """Compute if giro has been cleared"""
@@ -188,31 +196,47 @@ class AzGiroInput(models.Model):
         for record in self:
             record.is_clearing_reversed = bool(record.reverse_clearing_move_id)
 
+    def _search_is_reversed(self, operator, value):
+        """Search giros on whether they have a reverse entry"""
+        return self._get_move_set_domain('reverse_move_id', operator, value)
+
+    def _search_is_clearing_reversed(self, operator, value):
+        """Search giros on whether they have a reverse clearing entry"""
+        return self._get_move_set_domain('reverse_clearing_move_id', operator, value)
+
+    def _get_move_set_domain(self, field_name, operator, value):
+        """Get domain matching giros on whether the given move field is set"""
+        if operator not in ('=', '!='):
+            raise UserError(_('Operation not supported.'))
+        is_set = bool(value) == (operator == '=')
+        return [(field_name, '!=' if is_set else '=', False)]
+
 
     @api.onchange('partner_type')
     def _onchange_partner_type(self):
         """Reset partner when partner type changes"""
         self.partner_id = False
-        return {
-            'domain': {
-                'partner_id': self._get_partner_domain()
-            }
-        }
 
-    def _get_partner_domain(self):
-        """Get domain for partner_id based on partner_type"""
-        if self.partner_type == 'customer':
-            return [('customer_rank', '>', 0)]
-        elif self.partner_type == 'vendor':
-            return [('supplier_rank', '>', 0)]
-        return []
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to generate sequence"""
+        new_name = _('New')
+        for vals in vals_list:
+            if vals.get('name', new_name) == new_name:
+                vals['name'] = self.env['ir.sequence'].next_by_code('az.giro.input') or new_name
+        return super(AzGiroInput, self).create(vals_list)
 
     @api.model
-    def create(self, vals):
-        """Override create to generate sequence"""
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('az.giro.input') or _('New')
-        return super(AzGiroInput, self).create(vals)
+    def get_summary(self):
+        """Get giro count and total amount per state for the current company"""
+        return [
+            {'state': state, 'count': count, 'amount': amount}
+            for state, count, amount in self._read_group(
+                [('company_id', '=', self.env.company.id)],
+                groupby=['state'],
+                aggregates=['__count', 'amount:sum'],
+            )
+        ]
 
     def action_confirm(self):
         """Confirm the giro and create journal entry"""
@@ -222,18 +246,36 @@ class AzGiroInput(models.Model):
             
             if not record.giro_account_id:
                 raise ValidationError(_('Giro Account is required before confirmation.'))
-            
-            # Create journal entry
-            move = record._create_account_move()
-            
-            # Update state and link to journal entry
-            record.write({
-                'state': 'confirmed',
-                'account_move_id': move.id
-            })
-            
-            # Post the journal entry
-            move.action_post()
+        
+        # Get default journal (first one available) once per company
+        journals_by_company = {}
+        for company in self.company_id:
+            journal = self.env['account.journal'].search([
+                ('type', '=', 'general'),
+                ('company_id', '=', company.id)
+            ], limit=1)
+            if not journal:
+                raise ValidationError(_('No general journal found for company %s.') % company.name)
+            journals_by_company[company.id] = journal
+        
+        # Prefetch partner accounts for the whole batch, only the one each partner type needs
+        vendors = self.filtered(lambda r: r.partner_type == 'vendor')
+        vendors.partner_id.mapped('property_account_payable_id')
+        (self - vendors).partner_id.mapped('property_account_receivable_id')
+        
+        # Create journal entries for the whole batch at once, without creation tracking
+        moves = self.env['account.move'].with_context(tracking_disable=True).create([
+            record._prepare_account_move_vals(journals_by_company[record.company_id.id])
+            for record in self
+        ]).with_env(self.env)
+        
+        # Update state and link to journal entry
+        self.write({'state': 'confirmed'})
+        for record, move in zip(self, moves):
+            record.account_move_id = move
+        
+        # Post the journal entries
+        moves.action_post()
         
         return True
 
@@ -241,32 +283,30 @@ class AzGiroInput(models.Model):
         """Reset to draft"""
         for record in self:
             # Check clearing entry first
-            if record.clearing_move_id:
-                if record.clearing_move_id.state == 'posted':
-                    raise UserError(_('Cannot reset to draft. The clearing journal entry is already posted. Please cancel the clearing entry first.'))
-                # Delete the draft clearing entry
-                record.clearing_move_id.unlink()
-            
-            if record.state == 'confirmed' and record.account_move_id:
-                # Check if journal entry can be reset
-                if record.account_move_id.state == 'posted':
-                    raise UserError(_('Cannot reset to draft. The journal entry is already posted. Please cancel the journal entry first.'))
-                # Delete the draft journal entry
-                record.account_move_id.unlink()
+            if record.clearing_move_id.state == 'posted':
+                raise UserError(_('Cannot reset to draft. The clearing journal entry is already posted. Please cancel the clearing entry first.'))
             
-            record.write({
-                'state': 'draft',
-                'account_move_id': False,
-                'clearing_move_id': False
-            })
+            # Check if journal entry can be reset
+            if record.state == 'confirmed' and record.account_move_id.state == 'posted':
+                raise UserError(_('Cannot reset to draft. The journal entry is already posted. Please cancel the journal entry first.'))
+        
+        # Delete the draft clearing and journal entries
+        confirmed = self.filtered(lambda r: r.state == 'confirmed')
+        (self.clearing_move_id | confirmed.account_move_id).unlink()
+        
+        self.write({
+            'state': 'draft',
+            'account_move_id': False,
+            'clearing_move_id': False
+        })
         return True
 
     def action_cancel(self):
         """Cancel the giro"""
         for record in self:
-            if record.account_move_id and record.account_move_id.state == 'posted':
+            if record.account_move_id.state == 'posted':
                 raise UserError(_('Cannot cancel. Please reverse the journal entry first.'))
-            record.write({'state': 'cancelled'})
+        self.write({'state': 'cancelled'})
         return True
 
     def button_open_journal_entry(self):
@@ -292,26 +332,27 @@ class AzGiroInput(models.Model):
             if record.state != 'confirmed':
                 raise UserError(_('Only confirmed giro can be cleared.'))
             
-            if record.is_cleared:
+            if record.clearing_move_id:
                 raise UserError(_('This giro has already been cleared.'))
             
             if not record.journal_bank_id:
                 raise ValidationError(_('Bank Journal is required for clearing.'))
             
-            if not record.bank_account_id:
+            if not record.journal_bank_id.default_account_id:
                 raise ValidationError(_('Bank Account is not configured in the selected Bank Journal.'))
-            
-            # Create clearing journal entry
-            clearing_move = record._create_clearing_move()
-            
-            # Update record with clearing journal entry and set state to cleared
-            record.write({
-                'clearing_move_id': clearing_move.id,
-                'state': 'cleared'
-            })
-            
-            # Post the clearing journal entry
-            clearing_move.action_post()
+        
+        # Create clearing journal entries for the whole batch at once, without creation tracking
+        clearing_moves = self.env['account.move'].with_context(tracking_disable=True).create([
+            record._prepare_clearing_move_vals() for record in self
+        ]).with_env(self.env)
+        
+        # Update record with clearing journal entry and set state to cleared
+        self.write({'state': 'cleared'})
+        for record, clearing_move in zip(self, clearing_moves):
+            record.clearing_move_id = clearing_move
+        
+        # Post the clearing journal entries
+        clearing_moves.action_post()
         
         return True
 
@@ -344,23 +385,31 @@ class AzGiroInput(models.Model):
             if record.account_move_id.state != 'posted':
                 raise UserError(_('Only posted journal entries can be reversed.'))
             
-            if record.is_reversed:
+            if record.reverse_move_id:
                 raise UserError(_('This giro has already been reversed.'))
-            
-            # Create reverse journal entry
-            reverse_move = record._create_reverse_move(
-                record.account_move_id,
-                _('Reverse: %s') % record.name
-            )
-            
-            # Update record with reverse journal entry and set state to reversed
-            record.write({
-                'reverse_move_id': reverse_move.id,
-                'state': 'reversed'
-            })
-            
-            # Post the reverse journal entry
-            reverse_move.action_post()
+        
+        # Prefetch the lines of all entries to reverse in one go
+        self.account_move_id.line_ids.mapped('account_id')
+        self.account_move_id.line_ids.mapped('partner_id')
+        
+        # Reverse the journal entries for the whole batch at once
+        reverse_moves = self.account_move_id._reverse_moves(
+            default_values_list=[
+                record._prepare_reverse_move_default_values(
+                    record.account_move_id, _('Reverse: %s') % record.name
+                )
+                for record in self
+            ],
+            cancel=False,
+        )
+        
+        # Update record with reverse journal entry and set state to reversed
+        self.write({'state': 'reversed'})
+        for record, reverse_move in zip(self, reverse_moves):
+            record.reverse_move_id = reverse_move
+        
+        # Post the reverse journal entries
+        reverse_moves.action_post()
         
         return True
 
@@ -377,23 +426,31 @@ class AzGiroInput(models.Model):
             if record.clearing_move_id.state != 'posted':
                 raise UserError(_('Only posted clearing entries can be reversed.'))
             
-            if record.is_clearing_reversed:
+            if record.reverse_clearing_move_id:
                 raise UserError(_('This clearing has already been reversed.'))
-            
-            # Create reverse clearing journal entry
-            reverse_clearing_move = record._create_reverse_move(
-                record.clearing_move_id,
-                _('Reverse Clearing: %s') % record.name
-            )
-            
-            # Update record with reverse clearing journal entry and set state
-            record.write({
-                'reverse_clearing_move_id': reverse_clearing_move.id,
-                'state': 'clearing_reversed'
-            })
-            
-            # Post the reverse clearing journal entry
-            reverse_clearing_move.action_post()
+        
+        # Prefetch the lines of all clearing entries to reverse in one go
+        self.clearing_move_id.line_ids.mapped('account_id')
+        self.clearing_move_id.line_ids.mapped('partner_id')
+        
+        # Reverse the clearing journal entries for the whole batch at once
+        reverse_clearing_moves = self.clearing_move_id._reverse_moves(
+            default_values_list=[
+                record._prepare_reverse_move_default_values(
+                    record.clearing_move_id, _('Reverse Clearing: %s') % record.name
+                )
+                for record in self
+            ],
+            cancel=False,
+        )
+        
+        # Update record with reverse clearing journal entry and set state
+        self.write({'state': 'clearing_reversed'})
+        for record, reverse_clearing_move in zip(self, reverse_clearing_moves):
+            record.reverse_clearing_move_id = reverse_clearing_move
+        
+        # Post the reverse clearing journal entries
+        reverse_clearing_moves.action_post()
         
         return True
 
@@ -431,8 +488,8 @@ class AzGiroInput(models.Model):
 
 
 
-    def _create_account_move(self):
-        """Create journal entry for the giro"""
+    def _prepare_account_move_vals(self, journal):
+        """Prepare journal entry values for the giro"""
         self.ensure_one()
         
         # Get partner's payable or receivable account
@@ -445,54 +502,29 @@ class AzGiroInput(models.Model):
             if not partner_account:
                 raise ValidationError(_('Partner %s does not have a receivable account configured.') % self.partner_id.name)
         
-        # Get default journal (first one available)
-        journal = self.env['account.journal'].search([
-            ('type', '=', 'general'),
-            ('company_id', '=', self.company_id.id)
-        ], limit=1)
-        
-        if not journal:
-            raise ValidationError(_('No general journal found for company %s.') % self.company_id.name)
-        
         # Prepare move lines
-        move_lines = []
-        
-        # Debit line: Giro Account
-        debit_line = {
-            'account_id': self.giro_account_id.id,
+        base_line = {
             'partner_id': self.partner_id.id,
             'name': self.cheque_reference or self.name,
-            'debit': self.amount,
-            'credit': 0.0,
             'date': self.date,
         }
-        move_lines.append((0, 0, debit_line))
+        move_lines = [
+            # Debit line: Giro Account
+            Command.create({**base_line, 'account_id': self.giro_account_id.id, 'debit': self.amount, 'credit': 0.0}),
+            # Credit line: Partner's Payable/Receivable Account
+            Command.create({**base_line, 'account_id': partner_account.id, 'debit': 0.0, 'credit': self.amount}),
+        ]
         
-        # Credit line: Partner's Payable/Receivable Account
-        credit_line = {
-            'account_id': partner_account.id,
-            'partner_id': self.partner_id.id,
-            'name': self.cheque_reference or self.name,
-            'debit': 0.0,
-            'credit': self.amount,
-            'date': self.date,
-        }
-        move_lines.append((0, 0, credit_line))
-        
-        # Create account move
-        move_vals = {
+        return {
             'journal_id': journal.id,
             'date': self.date,
             'ref': self.name,
             'line_ids': move_lines,
             'partner_id': self.partner_id.id,
         }
-        
-        move = self.env['account.move'].create(move_vals)
-        return move
 
-    def _create_clearing_move(self):
-        """Create clearing journal entry"""
+    def _prepare_clearing_move_vals(self):
+        """Prepare clearing journal entry values"""
         self.ensure_one()
         
         # Get journal (use bank journal for clearing)
@@ -501,82 +533,44 @@ class AzGiroInput(models.Model):
         if not journal:
             raise ValidationError(_('Bank Journal is required for clearing.'))
         
-        # Prepare move lines
-        move_lines = []
+        today = fields.Date.context_today(self)
         
-        # Debit line: Bank Account
-        debit_line = {
-            'account_id': self.bank_account_id.id,
-            'partner_id': self.partner_id.id,
-            'name': _('Clearing: %s') % (self.cheque_reference or self.name),
-            'debit': self.amount,
-            'credit': 0.0,
-            'date': fields.Date.context_today(self),
-        }
-        move_lines.append((0, 0, debit_line))
-        
-        # Credit line: Giro Account
-        credit_line = {
-            'account_id': self.giro_account_id.id,
+        # Prepare move lines
+        base_line = {
             'partner_id': self.partner_id.id,
             'name': _('Clearing: %s') % (self.cheque_reference or self.name),
-            'debit': 0.0,
-            'credit': self.amount,
-            'date': fields.Date.context_today(self),
+            'date': today,
         }
-        move_lines.append((0, 0, credit_line))
+        move_lines = [
+            # Debit line: Bank Account
+            Command.create({**base_line, 'account_id': journal.default_account_id.id, 'debit': self.amount, 'credit': 0.0}),
+            # Credit line: Giro Account
+            Command.create({**base_line, 'account_id': self.giro_account_id.id, 'debit': 0.0, 'credit': self.amount}),
+        ]
         
-        # Create account move
-        move_vals = {
+        return {
             'journal_id': journal.id,
-            'date': fields.Date.context_today(self),
+            'date': today,
             'ref': _('Clearing: %s') % self.name,
             'line_ids': move_lines,
             'partner_id': self.partner_id.id,
         }
-        
-        move = self.env['account.move'].create(move_vals)
-        return move
 
-    def _create_reverse_move(self, original_move, reverse_ref):
-        """Create reverse journal entry from original move"""
+    def _prepare_reverse_move_default_values(self, original_move, reverse_ref):
+        """Prepare default values used when reversing a journal entry of the giro"""
         self.ensure_one()
         
-        if not original_move:
-            raise ValidationError(_('Original move is required for creating reverse entry.'))
-        
-        # Prepare reversed move lines
-        move_lines = []
-        
-        for line in original_move.line_ids:
-            # Reverse the debit and credit
-            reversed_line = {
-                'account_id': line.account_id.id,
-                'partner_id': line.partner_id.id if line.partner_id else False,
-                'name': line.name,
-                'debit': line.credit,  # Swap debit and credit
-                'credit': line.debit,
-                'date': fields.Date.context_today(self),
-            }
-            move_lines.append((0, 0, reversed_line))
-        
-        # Create reverse account move
-        move_vals = {
+        return {
             'journal_id': original_move.journal_id.id,
             'date': fields.Date.context_today(self),
             'ref': reverse_ref,
-            'line_ids': move_lines,
-            'partner_id': self.partner_id.id,
         }
-        
-        move = self.env['account.move'].create(move_vals)
-        return move
 
     def unlink(self):
         """Prevent deletion of confirmed giro"""
         for record in self:
             if record.state == 'confirmed':
                 raise UserError(_('Cannot delete confirmed giro. Please cancel it first.'))
-            if record.is_cleared:
+            if record.clearing_move_id:
                 raise UserError(_('Cannot delete cleared giro. Please reverse the clearing entry first.'))
         return super(AzGiroInput, self).unlink()
@@ -1,4 +1,6 @@
-from odoo import models, fields, _
+from collections import defaultdict
+
+from odoo import models, fields, _, Command
 from odoo.exceptions import UserError
 
 class MrpProduction(models.Model):
@@ -9,9 +11,8 @@ class MrpProduction(models.Model):
     def button_mark_done(self):
         res = super(MrpProduction, self).button_mark_done()
         is_automated = self.env['ir.config_parameter'].sudo().get_param('swa_acc.az_calculate_raf_pick_account_automate') == 'True'
-        for production in self:
-            if is_automated:
-                production._create_raf_pick_entries()
+        if is_automated:
+            self._create_raf_pick_entries()
         return res
 
     def action_view_az_account_moves(self):
@@ -27,29 +28,70 @@ class MrpProduction(models.Model):
 
 
     def _create_raf_pick_entries(self):
-        self.ensure_one()
-        
+        journals_by_company = self._get_raf_pick_journals()
+        # Prefetch the category accounts of all MOs and their components at once
+        self.product_id.categ_id.mapped('az_property_wip_account_id')
+        self.product_id.categ_id.mapped('az_property_raf_account_id')
+        self.move_raw_ids.product_id.categ_id.mapped('az_property_raw_material_account_id')
+
+        # Sum the stock valuation layer values of all raw and finished moves in one query
+        stock_moves = self.move_raw_ids | self.move_finished_ids
+        move_values = {
+            move.id: value
+            for move, value in self.env['stock.valuation.layer'].sudo()._read_group(
+                [('stock_move_id', 'in', stock_moves.ids)],
+                groupby=['stock_move_id'],
+                aggregates=['value:sum'],
+            )
+        }
+        # Prefetch the standard price used as fallback for moves without valuation
+        stock_moves.filtered(lambda m: not move_values.get(m.id)).product_id.mapped('standard_price')
+
+        today = fields.Date.context_today(self)
+        productions = self.env['mrp.production']
+        vals_list = []
+        for production in self:
+            move_vals = production._prepare_raf_pick_move_vals(
+                journals_by_company[production.company_id.id], move_values, today
+            )
+            if move_vals:
+                productions |= production
+                vals_list.append(move_vals)
+
+        # Create the entries of all MOs at once, without creation tracking
+        moves = self.env['account.move'].with_context(tracking_disable=True).create(vals_list)
+        # Link each MO to its entry once, after the batch create
+        for production, move in zip(productions, moves):
+            production.az_account_move_ids = [Command.link(move.id)]
+
+    def _get_raf_pick_journals(self):
         # Determine Journal: Try to find a general journal or create a specific one? 
-        # For now, pick the first journal of type 'general' for the company.
-        journal = self.env['account.journal'].search([
-            ('type', '=', 'general'), 
-            ('company_id', '=', self.company_id.id)
-        ], limit=1)
-        
-        if not journal:
-            raise UserError(_("Please define a General Journal for this company to use for Manufacturing Accounting automation."))
+        # For now, pick the first journal of type 'general' for each company, looked up once per company.
+        journals_by_company = {}
+        for company in self.company_id:
+            journal = self.env['account.journal'].search([
+                ('type', '=', 'general'), 
+                ('company_id', '=', company.id)
+            ], limit=1)
+            if not journal:
+                raise UserError(_("Please define a General Journal for this company to use for Manufacturing Accounting automation."))
+            journals_by_company[company.id] = journal
+        return journals_by_company
+
+    def _prepare_raf_pick_move_vals(self, journal, move_values, date):
+        self.ensure_one()
 
-        move_lines = []
-        
         # 1. Pick Entry (Raw Materials)
         # Debit WIP (Finished Good's Category) vs Credit Raw Material Account (Component's Category)
-        
-        wip_account = self.product_id.categ_id.az_property_wip_account_id
-        if not wip_account:
-            raise UserError(_("Please define a WIP Account for category: %s") % self.product_id.categ_id.name)
+
+        # Resolve the raw material account of each component category once
+        rm_account_by_categ = {
+            categ.id: categ.az_property_raw_material_account_id
+            for categ in self.move_raw_ids.product_id.categ_id
+        }
 
         # Aggregate raw material costs by account
-        raw_material_credits = {} # {account_id: amount}
+        raw_material_credits = defaultdict(float) # {account_id: amount}
         total_raw_material_cost = 0.0
 
         for move in self.move_raw_ids:
@@ -61,7 +103,7 @@ class MrpProduction(models.Model):
                 # Let's assume we take the value from the move directly if possible.
                 # Using sum of stock.valuation.layer value is the most accurate real cost.
                 
-                move_cost = sum(move.sudo().stock_valuation_layer_ids.mapped('value')) 
+                move_cost = move_values.get(move.id, 0.0)
                 # Note: value is usually negative for outgoing moves (consumed). We need absolute value.
                 move_cost = abs(move_cost)
                 
@@ -70,17 +112,44 @@ class MrpProduction(models.Model):
                      move_cost = move.quantity * move.product_id.standard_price
 
                 if move_cost > 0:
-                    rm_account = move.product_id.categ_id.az_property_raw_material_account_id
+                    rm_account = rm_account_by_categ[move.product_id.categ_id.id]
                     if not rm_account:
                          raise UserError(_("Please define a Raw Material Account for category: %s") % move.product_id.categ_id.name)
                     
-                    raw_material_credits[rm_account.id] = raw_material_credits.get(rm_account.id, 0.0) + move_cost
+                    raw_material_credits[rm_account.id] += move_cost
                     total_raw_material_cost += move_cost
 
+        # 2. RAF Entry (Finished Goods)
+        # Debit RAF Account (Finished Good's Category) vs Credit WIP (Finished Good's Category)
+
+        # Calculate Finished Good Value
+        total_finished_cost = 0.0
+        for move in self.move_finished_ids:
+             if move.state == 'done' and move.product_id == self.product_id:
+                # Finished good moves have positive value
+                move_cost = move_values.get(move.id, 0.0)
+                if move_cost == 0:
+                    move_cost = move.quantity * move.product_id.standard_price
+                total_finished_cost += move_cost
+
+        # Nothing to book: skip the account checks and the entry altogether
+        if total_raw_material_cost <= 0 and total_finished_cost <= 0:
+            return False
+
+        wip_account = self.product_id.categ_id.az_property_wip_account_id
+        if not wip_account:
+            raise UserError(_("Please define a WIP Account for category: %s") % self.product_id.categ_id.name)
+
+        raf_account = self.product_id.categ_id.az_property_raf_account_id
+        if not raf_account:
+             raise UserError(_("Please define a RAF Account for category: %s") % self.product_id.categ_id.name)
+
+        move_lines = []
+
         # Create Lines for Pick
         # Credit Raw Material Accounts
         for account_id, amount in raw_material_credits.items():
-            move_lines.append((0, 0, {
+            move_lines.append(Command.create({
                 'account_id': account_id,
                 'name': _('Raw Material Consumption - %s') % self.name,
                 'debit': 0.0,
@@ -89,54 +158,35 @@ class MrpProduction(models.Model):
         
         # Debit WIP Account (Total RM Cost)
         if total_raw_material_cost > 0:
-            move_lines.append((0, 0, {
+            move_lines.append(Command.create({
                 'account_id': wip_account.id,
                 'name': _('WIP - Material Consumption - %s') % self.name,
                 'debit': total_raw_material_cost,
                 'credit': 0.0,
             }))
 
-        # 2. RAF Entry (Finished Goods)
-        # Debit RAF Account (Finished Good's Category) vs Credit WIP (Finished Good's Category)
-        
-        raf_account = self.product_id.categ_id.az_property_raf_account_id
-        if not raf_account:
-             raise UserError(_("Please define a RAF Account for category: %s") % self.product_id.categ_id.name)
-        
-        # Calculate Finished Good Value
-        total_finished_cost = 0.0
-        for move in self.move_finished_ids:
-             if move.state == 'done' and move.product_id == self.product_id:
-                # Finished good moves have positive value
-                move_cost = sum(move.sudo().stock_valuation_layer_ids.mapped('value'))
-                if move_cost == 0:
-                    move_cost = move.quantity * move.product_id.standard_price
-                total_finished_cost += move_cost
-
+        # Create Lines for RAF
         if total_finished_cost > 0:
             # Debit RAF
-            move_lines.append((0, 0, {
+            move_lines.append(Command.create({
                 'account_id': raf_account.id,
                 'name': _('Report as Finished - %s') % self.name,
                 'debit': total_finished_cost,
                 'credit': 0.0,
             }))
             # Credit WIP
-            move_lines.append((0, 0, {
+            move_lines.append(Command.create({
                 'account_id': wip_account.id,
                 'name': _('WIP - Finished Goods - %s') % self.name,
                 'debit': 0.0,
                 'credit': total_finished_cost,
             }))
 
-        if move_lines:
-            move_vals = {
-                'journal_id': journal.id,
-                'date': fields.Date.today(),
-                'ref': self.name,
-                'line_ids': move_lines,
-                'move_type': 'entry',
-            }
-            move = self.env['account.move'].create(move_vals)
-            self.az_account_move_ids = [(4, move.id)]
+        return {
+            'journal_id': journal.id,
+            'date': date,
+            'ref': self.name,
+            'line_ids': move_lines,
+            'move_type': 'entry',
+        }
 
@@ -1,4 +1,5 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
+from collections import defaultdict
 from datetime import datetime, time
 from dateutil.relativedelta import relativedelta
 
@@ -57,8 +58,9 @@ class MrpWipAccountingLine(models.TransientModel):
     product_categ_id = fields.Many2one(
         comodel_name='product.category',
         string='Product Category',
-        compute='_compute_product_categ_id',
+        related='mo_id.product_id.categ_id',
         store=True,
+        readonly=True,
         help="Product category used for account resolution."
     )
     
@@ -99,7 +101,6 @@ class MrpWipAccountingLine(models.TransientModel):
     balance = fields.Monetary(
         string='Balance',
         compute='_compute_balance',
-        store=True,
         currency_field='currency_id',
         help="Net balance (Debit - Credit)."
     )
@@ -158,15 +159,6 @@ class MrpWipAccountingLine(models.TransientModel):
     # Compute Methods
     # -------------------------------------------------------------------------
     
-    @api.depends('mo_id', 'mo_id.product_id', 'mo_id.product_id.categ_id')
-    def _compute_product_categ_id(self):
-        """Compute product category from manufacturing order."""
-        for line in self:
-            if line.mo_id and line.mo_id.product_id:
-                line.product_categ_id = line.mo_id.product_id.categ_id
-            else:
-                line.product_categ_id = False
-    
     @api.depends('debit', 'credit')
     def _compute_balance(self):
         """Compute balance as debit minus credit."""
@@ -183,18 +175,33 @@ class MrpWipAccountingLine(models.TransientModel):
         2. Company default account
         3. System fallback
         """
+        # Lines sharing company, category and type resolve to the same account
+        cache = {}
         for line in self:
-            line.resolved_account_id = line._get_account_for_line_type()
+            key = (line.company_id.id, line.product_categ_id.id, line.line_type)
+            if key not in cache:
+                cache[key] = line._get_account_for_line_type()
+            line.resolved_account_id = cache[key]
     
     @api.depends('account_id', 'resolved_account_id', 'product_categ_id')
     def _compute_account_source(self):
         """Determine the source of the account."""
+        default_cache = {}
         for line in self:
             if not line.account_id:
                 line.account_source = False
-            elif line.product_categ_id and line.account_id == line.resolved_account_id:
+                continue
+            if line.product_categ_id and line.account_id == line.resolved_account_id:
                 line.account_source = 'category'
-            elif line.account_id == line._get_company_default_account():
+                continue
+            # Only WIP and overhead lines have a company default account
+            if line.line_type not in ('wip', 'overhead'):
+                line.account_source = 'manual'
+                continue
+            key = (line.company_id.id, line.line_type)
+            if key not in default_cache:
+                default_cache[key] = line._get_company_default_account()
+            if line.account_id == default_cache[key]:
                 line.account_source = 'company'
             else:
                 line.account_source = 'manual'
@@ -212,6 +219,8 @@ class MrpWipAccountingLine(models.TransientModel):
         self.ensure_one()
         
         if not self.product_categ_id:
+            if self.line_type not in ('wip', 'overhead'):
+                return self.env['account.account']
             return self._get_company_default_account()
         
         # Get accounts from specific product category
@@ -263,6 +272,7 @@ class MrpWipAccountingLine(models.TransientModel):
         Action to resolve account from Product Category.
         Updates the account_id field with the resolved account.
         """
+        type_labels = dict(self._fields['line_type'].selection)
         for line in self:
             resolved = line._get_account_for_line_type()
             if resolved:
@@ -272,7 +282,7 @@ class MrpWipAccountingLine(models.TransientModel):
                     "Could not resolve account for line type '%(type)s'. "
                     "Please configure the appropriate account in Product Category "
                     "or Company settings.",
-                    type=dict(self._fields['line_type'].selection).get(line.line_type)
+                    type=type_labels.get(line.line_type)
                 ))
     # -------------------------------------------------------------------------
     # Onchange Methods
@@ -280,9 +290,8 @@ class MrpWipAccountingLine(models.TransientModel):
     
     @api.onchange('mo_id')
     def _onchange_mo_id(self):
-        """Update product category and resolve account when MO changes."""
+        """Resolve account when MO changes."""
         if self.mo_id and self.mo_id.product_id:
-            self.product_categ_id = self.mo_id.product_id.categ_id
             # Auto-resolve account based on line type
             if self.line_type and not self.account_id:
                 self.account_id = self._get_account_for_line_type()
@@ -556,11 +565,10 @@ class MrpWipAccounting(models.TransientModel):
     @api.depends('date')
     def _compute_reversal_date(self):
         """Compute reversal date as the day after entry date."""
+        today = fields.Date.context_today(self)
+        one_day = timedelta(days=1)
         for wizard in self:
-            if wizard.date:
-                wizard.reversal_date = wizard.date + timedelta(days=1)
-            else:
-                wizard.reversal_date = fields.Date.context_today(wizard) + timedelta(days=1)
+            wizard.reversal_date = (wizard.date or today) + one_day
     
     @api.depends('mo_ids', 'date')
     def _compute_line_ids(self):
@@ -572,26 +580,36 @@ class MrpWipAccounting(models.TransientModel):
         - Overhead costs (labor, machine time, etc.)
         - WIP accumulation (debit)
         """
+        # Wizards on MOs of the same category share the resolved accounts
+        accounts_cache = {}
         for wizard in self:
+            # Posted or reversed wizards keep the lines they were posted with
+            if wizard.state != 'draft':
+                continue
+            
             if not wizard.mo_ids:
                 wizard.line_ids = [Command.clear()]
                 continue
             
-            line_vals = wizard._get_line_vals(wizard.mo_ids, wizard.date)
+            line_vals = wizard._get_line_vals(wizard.mo_ids, wizard.date, accounts_cache=accounts_cache)
             wizard.line_ids = [Command.clear()] + line_vals
     
     @api.depends('line_ids.debit', 'line_ids.credit')
     def _compute_totals(self):
         """Compute total debit, credit, and balanced status."""
         for wizard in self:
-            wizard.total_debit = sum(wizard.line_ids.mapped('debit'))
-            wizard.total_credit = sum(wizard.line_ids.mapped('credit'))
-            wizard.is_balanced = abs(wizard.total_debit - wizard.total_credit) < 0.01
+            debit = credit = 0.0
+            for line in wizard.line_ids:
+                debit += line.debit
+                credit += line.credit
+            wizard.total_debit = debit
+            wizard.total_credit = credit
+            wizard.is_balanced = abs(debit - credit) < 0.01
     # -------------------------------------------------------------------------
     # Account Resolution Methods (FIXED!)
     # -------------------------------------------------------------------------
     
-    def _get_accounts_from_category(self, productions):
+    def _get_accounts_from_category(self, productions, accounts_cache=None):
         """
         Get all required accounts from the Product Category of the manufactured product.
         
@@ -601,6 +619,7 @@ class MrpWipAccounting(models.TransientModel):
         
         Args:
             productions: mrp.production recordset
+            accounts_cache: optional dict memoizing the result per (category, company)
             
         Returns:
             dict: Dictionary with account IDs:
@@ -616,7 +635,7 @@ class MrpWipAccounting(models.TransientModel):
             return self._get_fallback_accounts()
         
         # Get the first MO's finished product category
-        # In multi-category scenarios, you may want to group by category
+        # Callers pass MOs of a single category (see _get_line_vals)
         first_mo = productions[0]
         product = first_mo.product_id
         
@@ -634,7 +653,12 @@ class MrpWipAccounting(models.TransientModel):
             return self._get_fallback_accounts()
         
         # Ensure we read with the correct company context
-        category = category.with_company(self.company_id or self.env.company)
+        company = self.company_id or self.env.company
+        category = category.with_company(company)
+        
+        cache_key = (category.id, company.id)
+        if accounts_cache is not None and cache_key in accounts_cache:
+            return accounts_cache[cache_key]
         
         _logger.info(
             "Resolving accounts from Product Category: %s (ID: %s) for MO: %s",
@@ -663,9 +687,12 @@ class MrpWipAccounting(models.TransientModel):
         # Log resolved accounts for debugging
         _logger.debug("Resolved accounts: %s", accounts)
         
-        # Validate required accounts
-        self._validate_accounts(accounts, category)
+        # Validate required accounts, building the error only when one is missing
+        if not (accounts['stock_valuation'] and accounts['wip'] and accounts['overhead']):
+            self._validate_accounts(accounts, category)
         
+        if accounts_cache is not None:
+            accounts_cache[cache_key] = accounts
         return accounts
     
     def _resolve_wip_account(self, category):
@@ -682,19 +709,14 @@ class MrpWipAccounting(models.TransientModel):
         Returns:
             int: Account ID or False
         """
-        # Priority 1: Category specific
-        if hasattr(category, 'az_property_wip_account_id') and category.az_property_wip_account_id:
-            _logger.debug("WIP account from category: %s", category.az_property_wip_account_id.code)
-            return category.az_property_wip_account_id.id
-        
-        # Priority 2: Company default
         company = self.company_id or self.env.company
-        if company.account_production_wip_account_id:
-            _logger.debug("WIP account from company: %s", company.account_production_wip_account_id.code)
-            return company.account_production_wip_account_id.id
-        
-        _logger.warning("No WIP account found for category %s", category.display_name)
-        return False
+        account_id = self._get_first_account((
+            (category, 'az_property_wip_account_id'),
+            (company, 'account_production_wip_account_id'),
+        ))
+        if not account_id:
+            _logger.warning("No WIP account found for category %s", category.display_name)
+        return account_id
     
     def _resolve_overhead_account(self, category):
         """
@@ -712,24 +734,16 @@ class MrpWipAccounting(models.TransientModel):
         Returns:
             int: Account ID or False
         """
-        # Priority 1: Category's custom overhead account
-        if hasattr(category, 'az_property_overhead_account_id') and category.az_property_overhead_account_id:
-            return category.az_property_overhead_account_id.id
-        
-        # Priority 2: Company default
         company = self.company_id or self.env.company
-        if company.account_production_wip_overhead_account_id:
-            return company.account_production_wip_overhead_account_id.id
-        
-        # Priority 3: Category's production cost account
-        if category.property_stock_account_production_cost_id:
-            return category.property_stock_account_production_cost_id.id
-        
-        # Priority 4: Category's stock input account
-        if category.property_stock_account_input_categ_id:
-            return category.property_stock_account_input_categ_id.id
-        
-        return False
+        candidates = (
+            (company, 'account_production_wip_overhead_account_id'),
+            (category, 'property_stock_account_production_cost_id'),
+            (category, 'property_stock_account_input_categ_id'),
+        )
+        # The custom overhead field is not declared by this module
+        if 'az_property_overhead_account_id' in category._fields:
+            candidates = ((category, 'az_property_overhead_account_id'),) + candidates
+        return self._get_first_account(candidates)
     
     def _resolve_raw_material_account(self, category):
         """
@@ -745,14 +759,27 @@ class MrpWipAccounting(models.TransientModel):
         Returns:
             int: Account ID or False
         """
-        # Priority 1: Category's custom raw material account
-        if hasattr(category, 'az_property_raw_material_account_id') and category.az_property_raw_material_account_id:
-            return category.az_property_raw_material_account_id.id
+        return self._get_first_account((
+            (category, 'az_property_raw_material_account_id'),
+            (category, 'property_stock_valuation_account_id'),
+        ))
+    
+    def _get_first_account(self, candidates):
+        """
+        Return the first account set on a list of (record, field name) probes.
         
-        # Priority 2: Stock valuation account
-        if category.property_stock_valuation_account_id:
-            return category.property_stock_valuation_account_id.id
+        The first read on a record prefetches its other account fields, so
+        the whole chain costs at most one query per record.
         
+        Args:
+            candidates: iterable of (record, field name) pairs in priority order
+            
+        Returns:
+            int: Account ID or False
+        """
+        for record, field_name in candidates:
+            if record[field_name]:
+                return record[field_name].id
         return False
     
     def _get_fallback_accounts(self):
@@ -844,7 +871,7 @@ class MrpWipAccounting(models.TransientModel):
         if productions:
             category = productions[0].product_id.categ_id.with_company(company)
             
-            if hasattr(category, 'az_property_overhead_account_id') and category.az_property_overhead_account_id:
+            if 'az_property_overhead_account_id' in category._fields and category.az_property_overhead_account_id:
                 return category.az_property_overhead_account_id.id
             
             if category.property_stock_account_production_cost_id:
@@ -872,7 +899,7 @@ class MrpWipAccounting(models.TransientModel):
     # Line Value Calculation Methods
     # -------------------------------------------------------------------------
     
-    def _get_line_vals(self, productions=False, date=False):
+    def _get_line_vals(self, productions=False, date=False, accounts_cache=None):
         """
         Calculate and return WIP accounting line values.
         
@@ -884,6 +911,7 @@ class MrpWipAccounting(models.TransientModel):
         Args:
             productions: mrp.production recordset
             date: datetime or date for filtering consumed materials
+            accounts_cache: optional dict shared across calls to memoize account resolution
             
         Returns:
             list: List of Command.create() tuples for line_ids
@@ -893,21 +921,63 @@ class MrpWipAccounting(models.TransientModel):
         
         if not date:
             date = datetime.now().replace(hour=23, minute=59, second=59)
-        elif isinstance(date, fields.date.__class__):
-            # Convert date to datetime for comparison
-            date = datetime.combine(date, datetime.max.time())
+        elif not isinstance(date, datetime):
+            # Convert date to datetime at end of day for comparison
+            date = datetime.combine(date, time.max)
+        
+        self._prefetch_categories(productions)
+        
+        # Group MOs by finished product category so each group gets the
+        # accounts of its own category, resolved once per group
+        by_categ = defaultdict(lambda: self.env['mrp.production'])
+        for mo in productions:
+            by_categ[mo.product_id.categ_id.id] |= mo
+        
+        # Build line values
+        lines = []
+        for group in by_categ.values():
+            lines += self._get_group_line_vals(group, date, accounts_cache=accounts_cache)
+        
+        return lines
+    
+    def _prefetch_categories(self, productions):
+        """
+        Load the products, categories and category accounts of the MOs in batch.
+        
+        Account resolution then reads every category from cache instead of
+        walking productions[0].product_id.categ_id one record at a time.
         
+        Args:
+            productions: mrp.production recordset
+        """
+        company = self.company_id or self.env.company
+        categories = productions.product_id.categ_id.with_company(company)
+        # Reading one company-dependent account field loads the others too
+        categories.mapped('property_stock_valuation_account_id')
+    
+    def _get_group_line_vals(self, group, date, accounts_cache=None):
+        """
+        Calculate WIP accounting line values for MOs sharing a product category.
+        
+        Args:
+            group: mrp.production recordset of a single product category
+            date: datetime cutoff for filtering consumed materials
+            accounts_cache: optional dict shared across calls to memoize account resolution
+            
+        Returns:
+            list: List of Command.create() tuples for line_ids
+        """
         # Calculate component value from consumed materials
-        compo_value = self._calculate_component_value(productions, date)
+        compo_value = self._calculate_component_value(group, date)
         
         # Calculate overhead value from work orders
-        overhead_value = self._calculate_overhead_value(productions, date)
+        overhead_value = self._calculate_overhead_value(group, date)
         
         # Get accounts from Product Category (FIXED!)
-        accounts = self._get_accounts_from_category(productions)
+        accounts = self._get_accounts_from_category(group, accounts_cache=accounts_cache)
         
-        # Build line values
         lines = []
+        mo_id = group.id if len(group) == 1 else False
         
         # Line 1: Credit Stock Valuation (Component Value)
         if compo_value:
@@ -918,7 +988,7 @@ class MrpWipAccounting(models.TransientModel):
                 'credit': compo_value,
                 'debit': 0.0,
                 'account_id': accounts['stock_valuation'],
-                'mo_id': productions[0].id if len(productions) == 1 else False,
+                'mo_id': mo_id,
             }))
         
         # Line 2: Credit Overhead Account
@@ -930,26 +1000,22 @@ class MrpWipAccounting(models.TransientModel):
                 'credit': overhead_value,
                 'debit': 0.0,
                 'account_id': accounts['overhead'],
-                'mo_id': productions[0].id if len(productions) == 1 else False,
+                'mo_id': mo_id,
             }))
         
         # Line 3: Debit WIP Account (Total)
         total_wip = compo_value + overhead_value
         if total_wip:
+            # Only format the MO names (locale-aware) when the line is emitted
+            orders_label = format_list(self.env, group.mapped('name')) if group else _("Manual Entry")
             lines.append(Command.create({
                 'sequence': 30,
-                'label': _(
-                    "Manufacturing WIP - %(orders_list)s",
-                    orders_list=(
-                        format_list(self.env, productions.mapped('name'))
-                        if productions else _("Manual Entry")
-                    )
-                ),
+                'label': _("Manufacturing WIP - %(orders_list)s", orders_list=orders_label),
                 'line_type': 'wip',
                 'debit': total_wip,
                 'credit': 0.0,
                 'account_id': accounts['wip'],
-                'mo_id': productions[0].id if len(productions) == 1 else False,
+                'mo_id': mo_id,
             }))
         
         return lines
@@ -976,8 +1042,6 @@ class MrpWipAccounting(models.TransientModel):
         # stock.move.line.date is a Datetime field, so we need to ensure
         # consistent comparison types
         # =========================================================================
-        from datetime import datetime, time
-        
         if isinstance(date, datetime):
             # Already datetime - use as-is
             compare_datetime = date
@@ -985,35 +1049,41 @@ class MrpWipAccounting(models.TransientModel):
             # It's a date object - convert to datetime at end of day
             compare_datetime = datetime.combine(date, time.max)
         
-        total_value = 0.0
+        # Sum picked quantities up to the cutoff date per product and lot in SQL;
+        # every line of a (product, lot) group shares the same unit price
+        groups = self.env['stock.move.line']._read_group(
+            domain=[
+                ('move_id', 'in', productions.move_raw_ids.ids),
+                ('picked', '=', True),
+                ('quantity', '!=', 0),
+                ('date', '<=', compare_datetime),
+            ],
+            groupby=['product_id', 'lot_id'],
+            aggregates=['quantity_product_uom:sum'],
+        )
+        
+        # Only build the per-group debug arguments (display_name) when they will be logged
+        debug = _logger.isEnabledFor(logging.DEBUG)
+        line_values = []
         
-        for ml in productions.move_raw_ids.move_line_ids:
-            # Skip if not picked or no quantity
-            if not ml.picked or not ml.quantity:
-                continue
-            
-            # Skip if move line date is after our cutoff
-            # FIX: ml.date is datetime, compare_datetime is also datetime now
-            if ml.date and ml.date > compare_datetime:
-                continue
-            
+        for product, lot, quantity in groups:
             # Determine unit price
-            product = ml.product_id
-            if product.lot_valuated and ml.lot_id and ml.lot_id.standard_price:
-                unit_price = ml.lot_id.standard_price
+            if product.lot_valuated and lot and lot.standard_price:
+                unit_price = lot.standard_price
             else:
                 unit_price = product.standard_price
             
-            # Calculate line value
-            line_value = ml.quantity_product_uom * unit_price
-            total_value += line_value
+            # Calculate group value
+            line_value = quantity * unit_price
+            line_values.append(line_value)
             
-            _logger.debug(
-                "Component: %s, Qty: %s, Price: %s, Value: %s",
-                product.display_name, ml.quantity_product_uom, unit_price, line_value
-            )
+            if debug:
+                _logger.debug(
+                    "Component: %s, Qty: %s, Price: %s, Value: %s",
+                    product.display_name, quantity, unit_price, line_value
+                )
         
-        return total_value
+        return sum(line_values)
     
     def _calculate_overhead_value(self, productions, date):
         """
@@ -1034,20 +1104,25 @@ class MrpWipAccounting(models.TransientModel):
             return productions.workorder_ids._cal_cost(date)
         
         # Fallback: Calculate based on duration and workcenter costs
+        workorders = productions.workorder_ids.filtered(lambda wo: wo.state in ('done', 'progress'))
+        # Prefetch workcenter rates in one query
+        workorders.workcenter_id.mapped('costs_hour')
+        
+        debug = _logger.isEnabledFor(logging.DEBUG)
         total_overhead = 0.0
         
-        for wo in productions.workorder_ids:
-            if wo.state in ['done', 'progress']:
-                # Get workcenter cost per hour
-                cost_per_hour = wo.workcenter_id.costs_hour or 0.0
-                
-                # Get duration in hours
-                duration_hours = wo.duration / 60.0 if wo.duration else 0.0
-                
-                # Calculate overhead
-                overhead = duration_hours * cost_per_hour
-                total_overhead += overhead
-                
+        for wo in workorders:
+            # Get workcenter cost per hour
+            cost_per_hour = wo.workcenter_id.costs_hour or 0.0
+            
+            # Get duration in hours
+            duration_hours = wo.duration / 60.0 if wo.duration else 0.0
+            
+            # Calculate overhead
+            overhead = duration_hours * cost_per_hour
+            total_overhead += overhead
+            
+            if debug:
                 _logger.debug(
                     "Work Order: %s, Duration: %s hrs, Cost/hr: %s, Overhead: %s",
                     wo.name, duration_hours, cost_per_hour, overhead
@@ -1067,20 +1142,39 @@ class MrpWipAccounting(models.TransientModel):
         Returns:
             dict: Action to view the created journal entry
         """
+        if len(self) > 1:
+            return self.action_post_multi()
         self.ensure_one()
         
-        # Validate
-        if not self.line_ids:
-            raise UserError(_("No lines to post. Please add at least one line."))
+        move = self._create_and_post_move()
         
-        if not self.is_balanced:
-            raise UserError(_(
-                "The journal entry is not balanced.\n"
-                "Total Debit: %(debit)s\n"
-                "Total Credit: %(credit)s",
-                debit=self.total_debit,
-                credit=self.total_credit
-            ))
+        # Update wizard
+        self.write({
+            'move_id': move.id,
+            'state': 'posted',
+        })
+        
+        # Return action to view the move
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('WIP Journal Entry'),
+            'res_model': 'account.move',
+            'res_id': move.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+    
+    def _create_and_post_move(self):
+        """
+        Create and post the WIP journal entry without updating the wizard.
+        
+        Returns:
+            account.move: The posted journal entry
+        """
+        self.ensure_one()
+        
+        # Validate
+        self._check_postable()
         
         # Prepare move values
         move_vals = self._prepare_move_vals()
@@ -1089,30 +1183,69 @@ class MrpWipAccounting(models.TransientModel):
         move = self.env['account.move'].create(move_vals)
         move.action_post()
         
-        # Update wizard
-        self.write({
-            'move_id': move.id,
-            'state': 'posted',
-        })
-        
-        # Link move to manufacturing orders
-        self._link_move_to_productions(move)
-        
         _logger.info(
             "Posted WIP journal entry %s for MOs: %s",
             move.name, self.mo_ids.mapped('name')
         )
+        return move
+    
+    def action_post_multi(self):
+        """
+        Post the WIP journal entries of several wizards at once.
+        
+        All moves are created in a single create() call and posted together.
+        
+        Returns:
+            dict: Action to view the created journal entries
+        """
+        # Validate everything before creating anything
+        for wizard in self:
+            wizard._check_postable()
+        
+        # Create and post the moves in one batch
+        moves = self.env['account.move'].create([wizard._prepare_move_vals() for wizard in self])
+        moves.action_post()
+        
+        # One write for the shared state, then link each wizard to its own move
+        self.write({'state': 'posted'})
+        for wizard, move in zip(self, moves):
+            wizard.move_id = move
+        
+        _logger.info(
+            "Posted WIP journal entries %s for MOs: %s",
+            moves.mapped('name'), self.mo_ids.mapped('name')
+        )
         
-        # Return action to view the move
         return {
             'type': 'ir.actions.act_window',
-            'name': _('WIP Journal Entry'),
+            'name': _('WIP Journal Entries'),
             'res_model': 'account.move',
-            'res_id': move.id,
-            'view_mode': 'form',
+            'domain': [('id', 'in', moves.ids)],
+            'view_mode': 'list,form',
             'target': 'current',
         }
     
+    def _check_postable(self):
+        """
+        Ensure the wizard has balanced lines to post.
+        
+        Raises:
+            UserError: If there are no lines or the entry is not balanced
+        """
+        self.ensure_one()
+        
+        if not self.line_ids:
+            raise UserError(_("No lines to post. Please add at least one line."))
+        
+        if not self.is_balanced:
+            raise UserError(_(
+                "The journal entry is not balanced.\n"
+                "Total Debit: %(debit)s\n"
+                "Total Credit: %(credit)s",
+                debit=self.total_debit,
+                credit=self.total_credit
+            ))
+    
     def action_post_and_reverse(self):
         """
         Post the WIP journal entry and create a reversal entry.
@@ -1124,16 +1257,13 @@ class MrpWipAccounting(models.TransientModel):
         """
         self.ensure_one()
         
-        # First post the original entry
-        self.action_post()
-        
-        if not self.move_id:
-            raise UserError(_("Failed to create the original journal entry."))
+        # First post the original entry; the wizard is updated once at the end
+        move = self._create_and_post_move()
         
         # Create reversal
         reversal_wizard = self.env['account.move.reversal'].with_context(
             active_model='account.move',
-            active_ids=[self.move_id.id],
+            active_ids=[move.id],
         ).create({
             'date': self.reversal_date,
             'reason': _("WIP Reversal - %(ref)s", ref=self.reference or ''),
@@ -1150,25 +1280,33 @@ class MrpWipAccounting(models.TransientModel):
         else:
             reversal_move = False
         
+        # Record the entry, its reversal and the resulting state in one write
+        wizard_vals = {
+            'move_id': move.id,
+            'state': 'posted',
+        }
         if reversal_move:
-            self.write({
+            wizard_vals.update({
                 'reversal_move_id': reversal_move.id,
                 'state': 'reversed',
             })
-        
-        _logger.info(
-            "Posted WIP entry %s and reversal %s",
-            self.move_id.name,
-            reversal_move.name if reversal_move else 'N/A'
-        )
+        self.write(wizard_vals)
+        
+        # Only read the reversal's name when it will be logged
+        if _logger.isEnabledFor(logging.INFO):
+            _logger.info(
+                "Posted WIP entry %s and reversal %s",
+                move.name,
+                reversal_move.name if reversal_move else 'N/A'
+            )
         
         # Return action to view both moves
         return {
             'type': 'ir.actions.act_window',
             'name': _('WIP Journal Entries'),
             'res_model': 'account.move',
-            'domain': [('id', 'in', [self.move_id.id, reversal_move.id if reversal_move else 0])],
-            'view_mode': 'tree,form',
+            'domain': [('id', 'in', [move.id, reversal_move.id if reversal_move else 0])],
+            'view_mode': 'list,form',
             'target': 'current',
         }
     
@@ -1209,17 +1347,20 @@ class MrpWipAccounting(models.TransientModel):
         """
         self.ensure_one()
         
-        line_vals = []
-        for line in self.line_ids:
-            line_vals.append(Command.create({
+        # Lines are fetched for the whole recordset on first access, the
+        # comprehension then only reads from cache
+        line_vals = [
+            Command.create({
                 'name': line.label,
                 'account_id': line.account_id.id,
                 'debit': line.debit,
                 'credit': line.credit,
                 'analytic_distribution': line.analytic_distribution,
-            }))
+            })
+            for line in self.line_ids
+        ]
         
-        return {
+        move_vals = {
             'journal_id': self.journal_id.id,
             'date': self.date,
             'ref': self.reference,
@@ -1227,25 +1368,10 @@ class MrpWipAccounting(models.TransientModel):
             'line_ids': line_vals,
             'company_id': self.company_id.id,
         }
-    
-    def _link_move_to_productions(self, move):
-        """
-        Link the created journal entry to the manufacturing orders.
-        
-        This allows tracking WIP entries from the MO form.
         
-        Args:
-            move: account.move record
-        """
-        # If there's a field on MO to track WIP moves, link them here
-        # Example:
-        # if hasattr(self.mo_ids, 'wip_move_ids'):
-        #     self.mo_ids.write({'wip_move_ids': [Command.link(move.id)]})
-        
-        # For now, just add the MO references to the move's narration
+        # Add the MO references to the move's narration at creation
         if self.mo_ids:
             mo_names = ", ".join(self.mo_ids.mapped('name'))
-            if move.narration:
-                move.narration += f"\n\nRelated Manufacturing Orders: {mo_names}"
-            else:
-                move.narration = f"Related Manufacturing Orders: {mo_names}"
+            move_vals['narration'] = f"Related Manufacturing Orders: {mo_names}"
+        
+        return move_vals
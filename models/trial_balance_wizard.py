@@ -48,8 +48,9 @@ class TrialBalanceWizard(models.TransientModel):
 
     def action_generate(self):
         self.ensure_one()
-        # Clean up all previous lines for this user to avoid cache/duplicate issues on navigation
-        self.env['swa.trial.balance.line'].search([('create_uid', '=', self.env.uid)]).unlink()
+        # Clean up the previous lines of this wizard to avoid duplicates on regeneration;
+        # lines of other wizards are left to the transient vacuum
+        self.line_ids.unlink()
         
         domain = [
             ('company_id', '=', self.company_id.id)
@@ -65,47 +66,35 @@ class TrialBalanceWizard(models.TransientModel):
         if self.target_move == 'posted':
             domain.append(('parent_state', '=', 'posted'))
         
-        move_lines = self.env['account.move.line'].search(domain)
+        # Filter accounts on their totals in SQL (HAVING) rather than after fetching them
+        having = []
+        if self.show_accounts == 'movement':
+            having = ['|', ('debit:sum', '!=', 0), ('credit:sum', '!=', 0)]
+        elif self.show_accounts == 'not_zero':
+            having = [('balance:sum', '!=', 0)]
         
-        account_data = {}
-        for line in move_lines:
-            acc_id = line.account_id.id
-            if acc_id not in account_data:
-                account_data[acc_id] = {
-                    'account_id': line.account_id.id,
-                    'code': line.account_id.code,
-                    'name': line.account_id.name,
-                    'debit': 0.0,
-                    'credit': 0.0,
-                }
-            account_data[acc_id]['debit'] += line.debit
-            account_data[acc_id]['credit'] += line.credit
+        # Sum debit and credit per account in SQL instead of walking every line
+        groups = self.env['account.move.line']._read_group(
+            domain,
+            groupby=['account_id'],
+            aggregates=['debit:sum', 'credit:sum'],
+            having=having,
+        )
         
         lines_to_create = []
-        for acc_id, data in account_data.items():
-            balance = data['debit'] - data['credit']
-            
-            if self.show_accounts == 'movement' and data['debit'] == 0 and data['credit'] == 0:
-                continue
-            if self.show_accounts == 'not_zero' and balance == 0:
-                continue
-            
+        for account, debit, credit in groups:
             lines_to_create.append({
                 'wizard_id': self.id,
-                'account_id': data['account_id'],
-                'debit': data['debit'],
-                'credit': data['credit'],
-                'balance': balance,
+                'account_id': account.id,
+                'debit': debit,
+                'credit': credit,
                 'date_from': self.date_from,
                 'date_to': self.date_to,
                 'company_id': self.company_id.id,
                 'target_move': self.target_move,
             })
         
-        lines_to_create.sort(key=lambda x: x.get('account_id'))
-        
-        for line_vals in lines_to_create:
-            self.env['swa.trial.balance.line'].create(line_vals)
+        self.env['swa.trial.balance.line'].create(lines_to_create)
         
         action = self.env["ir.actions.act_window"]._for_xml_id("swa_acc.action_trial_balance_result")
         # The 'domain' here relies on the wizard_id (self.id).
@@ -124,10 +113,12 @@ class TrialBalanceWizard(models.TransientModel):
 class TrialBalanceLine(models.TransientModel):
     _name = 'swa.trial.balance.line'
     _description = 'Trial Balance Line'
+    _order = 'account_id, id'
 
     wizard_id = fields.Many2one(
         'swa.trial.balance.wizard',
-        string='Wizard'
+        string='Wizard',
+        index=True
     )
     account_id = fields.Many2one(
         'account.account',
@@ -143,7 +134,9 @@ class TrialBalanceLine(models.TransientModel):
     )
     balance = fields.Monetary(
         string='Balance',
-        currency_field='currency_id'
+        currency_field='currency_id',
+        compute='_compute_balance',
+        store=True
     )
     currency_id = fields.Many2one(
         'res.currency',
@@ -165,6 +158,11 @@ class TrialBalanceLine(models.TransientModel):
         ('all', 'All Entries')
     ], string='Target Moves')
 
+    @api.depends('debit', 'credit')
+    def _compute_balance(self):
+        for line in self:
+            line.balance = line.debit - line.credit
+
     def action_view_history(self):
         self.ensure_one()
         